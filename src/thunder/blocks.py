@@ -8,6 +8,7 @@
 
 __all__ = [
     "convolution_stft",
+    "ConvolutionSTFT",
     "MultiSequential",
     "Masked",
     "normalize_tensor",
@@ -35,25 +36,11 @@ def _fourier_matrix(n_fft: int, device: torch.device) -> torch.Tensor:
     return torch.exp(torch.complex(real, imaginary))
 
 
-def convolution_stft(
-    input_data: torch.Tensor,
-    n_fft: int = 1024,
-    hop_length: int = 512,
-    win_length: int = 1024,
-    window: torch.Tensor = torch.hann_window(1024, periodic=False),
-    center: bool = True,
-    return_complex: bool = False,
+def _windowed_fourier_basis(
+    n_fft: int, win_length: int, window: torch.Tensor
 ) -> torch.Tensor:
-    """Implements the stft operation using the convolution method. This is one alternative
-    to make possible to export code using this operation to onnx and arm based environments.
-    The signature shuld follow the same as torch.stft, making it possible to just swap the two.
-    The code is based on https://github.com/pseeth/torch-stft
-    """
-    assert n_fft >= win_length
-    pad_amount = int(n_fft / 2)
-    window = window.to(input_data.device)
-
-    fourier_basis = _fourier_matrix(n_fft, device=input_data.device)
+    # Builds the conv1d weights that implement the windowed stft
+    fourier_basis = _fourier_matrix(n_fft, device=window.device)
 
     cutoff = int((n_fft / 2 + 1))
     fourier_basis = torch.stack(
@@ -65,9 +52,17 @@ def convolution_stft(
     window_pad2 = n_fft - (window_pad + win_length)
     fft_window = torch.nn.functional.pad(window, [window_pad, window_pad2])
     # window the bases
-    forward_basis *= fft_window
-    forward_basis = forward_basis.float()
+    forward_basis = forward_basis * fft_window
+    return forward_basis.float()
+
 
+def _convolution_stft_forward(
+    input_data: torch.Tensor,
+    forward_basis: torch.Tensor,
+    n_fft: int,
+    hop_length: int,
+) -> torch.Tensor:
+    pad_amount = int(n_fft / 2)
     num_batches = input_data.shape[0]
     num_samples = input_data.shape[-1]
 
@@ -91,13 +86,81 @@ def convolution_stft(
     return torch.stack((real_part, imag_part), dim=-1)
 
 
+def convolution_stft(
+    input_data: torch.Tensor,
+    n_fft: int = 1024,
+    hop_length: int = 512,
+    win_length: int = 1024,
+    window: torch.Tensor = torch.hann_window(1024, periodic=False),
+    center: bool = True,
+    return_complex: bool = False,
+) -> torch.Tensor:
+    """Implements the stft operation using the convolution method. This is one alternative
+    to make possible to export code using this operation to onnx and arm based environments.
+    The signature shuld follow the same as torch.stft, making it possible to just swap the two.
+    The code is based on https://github.com/pseeth/torch-stft
+    """
+    assert n_fft >= win_length
+    window = window.to(input_data.device)
+    forward_basis = _windowed_fourier_basis(n_fft, win_length, window)
+    return _convolution_stft_forward(input_data, forward_basis, n_fft, hop_length)
+
+
+class ConvolutionSTFT(nn.Module):
+    def __init__(
+        self, n_fft: int, hop_length: int, win_length: int, window: torch.Tensor
+    ):
+        """Module version of [`convolution_stft`][thunder.blocks.convolution_stft],
+        with the windowed fourier basis precomputed as a buffer. The basis only
+        depends on the constructor arguments, and keeping it constant is what
+        allows the convolution to be exported to onnx.
+
+        Args:
+            n_fft: Number of fourier features.
+            hop_length: Stride between the stft windows.
+            win_length: Number of elements in the stft window.
+            window: Window tensor, of shape (win_length,)
+        """
+        super().__init__()
+        assert n_fft >= win_length
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.register_buffer(
+            "forward_basis", _windowed_fourier_basis(n_fft, win_length, window.float())
+        )
+
+    def forward(
+        self,
+        input_data: torch.Tensor,
+        n_fft: int = 1024,
+        hop_length: int = 512,
+        win_length: int = 1024,
+        window: Optional[torch.Tensor] = None,
+        center: bool = True,
+        return_complex: bool = False,
+    ) -> torch.Tensor:
+        """Same signature as torch.stft, so instances can be dropped in its
+        place. The basis related arguments are ignored, as they are already
+        baked into the buffer built by the constructor.
+
+        Args:
+            input_data: Tensor of shape (batch, time)
+        """
+        return _convolution_stft_forward(
+            input_data, self.forward_basis, self.n_fft, self.hop_length
+        )
+
+
 class MultiSequential(nn.Sequential):
     """nn.Sequential equivalent with 2 inputs/outputs"""
 
     def forward(
         self, audio: torch.Tensor, audio_lengths: torch.Tensor
     ) -> Tuple[torch.Tensor, torch.Tensor]:
-        for module in self.children():
+        # Iterating the container directly skips the dedup bookkeeping that
+        # children() does on every forward. Torchscript unrolls the loop
+        # either way, so this only affects eager execution.
+        for module in self:
             audio, audio_lengths = module(audio, audio_lengths)
         return audio, audio_lengths
 
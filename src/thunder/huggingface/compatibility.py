@@ -6,6 +6,7 @@
 
 # Copyright (c) 2021-2022 scart97
 
+import os
 from typing import Any, Dict, Optional, Tuple
 from warnings import warn
 
@@ -14,26 +15,55 @@ from torch import Tensor, nn
 from torchaudio.models.wav2vec2.utils import import_huggingface_model
 from transformers import AutoFeatureExtractor, AutoModelForCTC, AutoTokenizer
 
-from thunder.blocks import lengths_to_mask, linear_decoder
+from thunder.blocks import linear_decoder
 from thunder.huggingface.transform import Wav2Vec2Preprocess
 from thunder.module import BaseCTCModule
 from thunder.text_processing.transform import BatchTextTransformer
 
 
 class _HuggingFaceEncoderAdapt(nn.Module):
+    # Maximum number of memoized attention masks
+    _MASK_CACHE_SIZE = 8
+
     def __init__(self, encoder, mask_input: bool = False):
         super().__init__()
         self.original_encoder = encoder
         if hasattr(self.original_encoder, "freeze_feature_encoder"):
             self.original_encoder.freeze_feature_encoder()
         self.mask_input = mask_input
+        self._mask_cache: Dict[Tuple[int, int], Tuple[Tensor, Tensor]] = {}
+
+    def _get_attention_mask(self, audio_lengths: Tensor, max_length: int) -> Tensor:
+        # Memoize the mask so that repeated batches, common during inference
+        # with fixed size inputs, skip rebuilding the same tensor every call.
+        # The caching allocator reuses freed addresses, so data_ptr alone
+        # can't identify the contents: keep a copy of the lengths next to
+        # each cached mask and confirm they still match before reusing it.
+        key = (audio_lengths.data_ptr(), max_length)
+        cached = self._mask_cache.get(key)
+        if cached is not None:
+            cached_lengths, attention_mask = cached
+            if torch.equal(cached_lengths, audio_lengths):
+                return attention_mask
+        # Built directly in the integer dtype the encoder expects, instead
+        # of going through lengths_to_mask and casting the bool result
+        attention_mask = (
+            torch.arange(max_length, device=audio_lengths.device).unsqueeze(0)
+            < audio_lengths.long().unsqueeze(1)
+        ).to(torch.int32)
+        if len(self._mask_cache) >= self._MASK_CACHE_SIZE:
+            self._mask_cache.pop(next(iter(self._mask_cache)))
+        self._mask_cache[key] = (audio_lengths.clone(), attention_mask)
+        return attention_mask
 
     def forward(self, audio: Tensor, audio_lengths: Tensor) -> Tuple[Tensor, Tensor]:
         attention_mask: Optional[Tensor] = None
         if self.mask_input:
-            attention_mask = lengths_to_mask(
-                audio_lengths, max_length=audio.size(-1)
-            ).int()
+            max_length = audio.size(-1)
+            # A tightly padded batch would produce an all-ones mask, so skip
+            # building it and the masked ops it triggers inside the encoder
+            if not bool((audio_lengths == max_length).all()):
+                attention_mask = self._get_attention_mask(audio_lengths, max_length)
         out = self.original_encoder(audio, attention_mask=attention_mask)
         out_correct_shape = out.last_hidden_state.transpose(-1, -2)
         return (
@@ -50,10 +80,17 @@ def _get_special_token(tokenizer: AutoTokenizer, token_name: str):
 
 
 def _tok_to_transform(tokenizer: AutoTokenizer) -> BatchTextTransformer:
-    vocab = [v if v != "|" else " " for v in tokenizer.get_vocab().keys()]
+    # Iterating over the ids directly avoids materializing the full vocab dict
+    # and guarantees the token order matches the model lm_head, which the
+    # ordering of get_vocab() keys does not.
+    vocab = [
+        v if v != "|" else " "
+        for v in tokenizer.convert_ids_to_tokens(list(range(tokenizer.vocab_size)))
+    ]
     # Remove tokens that were added after the model was trained
     for t in tokenizer.additional_special_tokens:
-        vocab.remove(t)
+        if t in vocab:
+            vocab.remove(t)
     return BatchTextTransformer(
         tokens=vocab,
         blank_token=_get_special_token(tokenizer, "pad_token"),
@@ -74,12 +111,23 @@ def load_huggingface_checkpoint(
     Returns:
         Thunder module containing the huggingface model.
     """
+    # Share the hub cache between every from_pretrained call, so multiple
+    # workers loading the same model hit one cache instead of re-downloading
+    cache_dir = os.environ.get("HUGGINGFACE_HUB_CACHE") or os.environ.get(
+        "TRANSFORMERS_CACHE"
+    )
+    if cache_dir is not None:
+        model_kwargs.setdefault("cache_dir", cache_dir)
+    cache_dir = model_kwargs.get("cache_dir")
+
     model = AutoModelForCTC.from_pretrained(model_name, **model_kwargs)
-    feature_extractor = AutoFeatureExtractor.from_pretrained(model_name)
+    feature_extractor = AutoFeatureExtractor.from_pretrained(
+        model_name, cache_dir=cache_dir
+    )
     # Some models only contain the encoder, and no tokenizer
     # In that case we need to warn the user to fix it before training
     try:
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
         text_transform = _tok_to_transform(tokenizer)
         decoder = linear_decoder(
             model.base_model.config.hidden_size,
@@ -133,3 +181,43 @@ def prepare_scriptable_wav2vec(
     module.encoder = imported
     module.decoder = nn.Sequential(*module.decoder[1:])
     return module
+
+
+class _Wav2Vec2EncoderWithTransform(nn.Module):
+    # Bundles the audio normalization with the encoder, so the scripted
+    # encoder accepts raw audio just like the original module forward.
+    # The torchaudio model returns optional lengths, so MultiSequential
+    # can't be used to compose the two.
+    def __init__(self, audio_transform: nn.Module, encoder: nn.Module):
+        super().__init__()
+        self.audio_transform = audio_transform
+        self.encoder = encoder
+
+    def forward(
+        self, audio: Tensor, audio_lengths: Tensor
+    ) -> Tuple[Tensor, Optional[Tensor]]:
+        features, feature_lengths = self.audio_transform(audio, audio_lengths)
+        return self.encoder(features, feature_lengths)
+
+
+def scriptable_wav2vec_components(
+    module: BaseCTCModule, quantized: bool = False
+) -> Tuple[nn.Module, nn.Module]:
+    """Converts thunder module containing a wav2vec2 model into separately
+    scripted encoder and decoder.
+
+    Splitting the two lets serving code run the expensive encoder once and
+    reuse its output across multiple decoder calls, instead of paying the
+    full forward every time. The returned encoder includes the audio
+    normalization, so it takes raw audio exactly like the full module.
+
+    Args:
+        module: Module containing wav2vec2
+        quantized: If true, also performs quantization of the model
+
+    Returns:
+        Tuple with the scripted encoder and the scripted decoder.
+    """
+    module = prepare_scriptable_wav2vec(module, quantized)
+    encoder = _Wav2Vec2EncoderWithTransform(module.audio_transform, module.encoder)
+    return torch.jit.script(encoder), torch.jit.script(module.decoder)
@@ -34,6 +34,7 @@ class BaseCTCModule(pl.LightningModule):
         lr_scheduler_class: SchedulerBuilderType = None,
         lr_scheduler_kwargs: Dict = None,
         encoder_final_dimension: int = None,
+        amp_dtype: Optional[torch.dtype] = None,
     ):
         """Base module for all systems that follow the same CTC training procedure.
 
@@ -47,6 +48,9 @@ class BaseCTCModule(pl.LightningModule):
             lr_scheduler_class: Optional class to use a learning rate scheduler with the optimizer.
             lr_scheduler_kwargs: Optional extra kwargs to the learning rate scheduler.
             encoder_final_dimension: number of features in the encoder output.
+            amp_dtype: Optional mixed precision dtype, like `torch.bfloat16`. When set, the
+                encoder and decoder run under autocast on cuda inputs. The audio transform
+                always stays in full precision, as it's small and numerically sensitive.
         """
         super().__init__()
 
@@ -62,11 +66,20 @@ class BaseCTCModule(pl.LightningModule):
         self.lr_scheduler_interval = self.lr_scheduler_kwargs.pop("interval", "step")
 
         self.encoder_final_dimension = encoder_final_dimension
+        self.amp_dtype = amp_dtype
 
         # Metrics
         self.validation_cer = CharErrorRate()
         self.validation_wer = WordErrorRate()
-        self.example_input_array = (
+        # Decoding the targets is deterministic given the batch texts,
+        # so the result is cached and reused across validation epochs
+        self._decoded_targets_cache: Dict[Tuple[str, ...], List[str]] = {}
+
+    @property
+    def example_input_array(self) -> Tuple[Tensor, Tensor]:
+        # Only used by lightning for shape inference during training.
+        # Built lazily so pure inference doesn't pay for the allocation.
+        return (
             torch.randn((10, 16000)),
             torch.randint(100, 16000, (10,)),
         )
@@ -81,7 +94,24 @@ class BaseCTCModule(pl.LightningModule):
         Returns:
             Tensor with the predictions.
         """
+        if not torch.jit.is_scripting():
+            # This block must stay behind a bare is_scripting() check: the
+            # torchscript frontend only eliminates the body of that exact
+            # pattern, and self.device is a lightning property that doesn't
+            # compile under torchscript
+            if x.device.type == "cpu" and self.device.type == "cuda":
+                # Stage the input through pinned memory so the host to device
+                # copy is asynchronous instead of blocking the compute stream
+                x = x.pin_memory().to(self.device, non_blocking=True)
+                lengths = lengths.to(self.device, non_blocking=True)
         features, feature_lengths = self.audio_transform(x, lengths)
+        if not torch.jit.is_scripting():
+            # Same bare is_scripting() pattern as above, so the autocast
+            # context and the dtype attribute never reach the scripted graph
+            if self.amp_dtype is not None and features.is_cuda:
+                with torch.autocast("cuda", dtype=self.amp_dtype):
+                    encoded, out_lengths = self.encoder(features, feature_lengths)
+                    return self.decoder(encoded), out_lengths
         encoded, out_lengths = self.encoder(features, feature_lengths)
         return self.decoder(encoded), out_lengths
 
@@ -151,9 +181,13 @@ class BaseCTCModule(pl.LightningModule):
         )
 
         decoded_preds = self.text_transform.decode_prediction(probabilities.argmax(1))
-        decoded_targets = self.text_transform.decode_prediction(
-            y, remove_repeated=False
-        )
+        targets_key = tuple(texts)
+        decoded_targets = self._decoded_targets_cache.get(targets_key)
+        if decoded_targets is None:
+            decoded_targets = self.text_transform.decode_prediction(
+                y, remove_repeated=False
+            )
+            self._decoded_targets_cache[targets_key] = decoded_targets
         self.validation_cer(decoded_preds, decoded_targets)
         self.validation_wer(decoded_preds, decoded_targets)
 
@@ -173,7 +207,7 @@ class BaseCTCModule(pl.LightningModule):
     def configure_optimizers(self) -> Union[torch.optim.Optimizer, Dict[str, Any]]:
         optim_kwargs = self._update_special_optimizer_arg(self.optimizer_kwargs)
         optimizer = self.optimizer_class(
-            filter(lambda p: p.requires_grad, self.parameters()), **optim_kwargs
+            [p for p in self.parameters() if p.requires_grad], **optim_kwargs
         )
         if not self.lr_scheduler_class:
             return optimizer
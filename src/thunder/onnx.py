@@ -0,0 +1,133 @@
+"""Helpers to export a trained model to onnx and serve it with onnxruntime.
+"""
+
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# Copyright (c) 2021-2022 scart97
+
+__all__ = ["prepare_for_export", "export_onnx", "OnnxPredictModule"]
+
+from typing import List, Optional
+
+import torch
+
+from thunder.blocks import ConvolutionSTFT
+from thunder.module import BaseCTCModule
+from thunder.quartznet.blocks import MaskedConv1d
+from thunder.quartznet.transform import PowerSpectrum
+from thunder.text_processing.transform import BatchTextTransformer
+
+
+def prepare_for_export(module: BaseCTCModule) -> BaseCTCModule:
+    """Rewrites, in place, the parts of the model that the onnx export
+    doesn't support.
+
+    The fft based spectrogram is replaced by the convolution implementation,
+    the same patch applied by [`patch_stft`][thunder.quartznet.transform.patch_stft],
+    and the input masking of the masked convolutions is disabled. The masking
+    only affects batches with elements of mixed lengths, which the predict
+    interface never produces.
+
+    Args:
+        module: Module to be prepared. Will be put in eval mode.
+
+    Returns:
+        The modified module. Should only be used for inference after this.
+    """
+    module = module.eval()
+    # The patch registers new submodules, so iterate over a frozen list
+    for layer in list(module.modules()):
+        if isinstance(layer, PowerSpectrum):
+            layer.stft_func = ConvolutionSTFT(
+                layer.n_fft,
+                layer.hop_length,
+                layer.win_length,
+                layer.window,
+            )
+        elif isinstance(layer, MaskedConv1d):
+            layer.use_mask = False
+    return module
+
+
+def export_onnx(module: BaseCTCModule, output_path: str, opset_version: int = 14):
+    """Export the module to an onnx file with dynamic batch and time axes.
+
+    The exported graph benefits from the constant folding and conv+batchnorm
+    fusion done by onnxruntime, which usually beats eager pytorch on cpu.
+
+    Args:
+        module: Module to be exported. Will be put in eval mode and modified
+            by [`prepare_for_export`][thunder.onnx.prepare_for_export].
+        output_path: Path where the .onnx file will be saved.
+        opset_version: Onnx opset version used during the export.
+    """
+    module = prepare_for_export(module)
+    torch.onnx.export(
+        module,
+        module.example_input_array,
+        output_path,
+        opset_version=opset_version,
+        input_names=["audio", "audio_lengths"],
+        output_names=["probabilities", "prob_lengths"],
+        dynamic_axes={
+            "audio": {0: "batch", 1: "time"},
+            "audio_lengths": {0: "batch"},
+            "probabilities": {0: "batch", 2: "time"},
+            "prob_lengths": {0: "batch"},
+        },
+    )
+
+
+class OnnxPredictModule:
+    def __init__(
+        self,
+        model_path: str,
+        text_transform: BatchTextTransformer,
+        providers: Optional[List[str]] = None,
+    ):
+        """Serve a model exported by [`export_onnx`][thunder.onnx.export_onnx]
+        with onnxruntime, keeping the same `predict` interface as
+        [`BaseCTCModule`][thunder.module.BaseCTCModule].
+
+        The onnxruntime session is created once and reused across calls.
+
+        Args:
+            model_path: Path to the exported .onnx file.
+            text_transform: Text transform of the original module, used to decode the predictions.
+            providers: Optional list of onnxruntime execution providers, in priority order.
+
+        Raises:
+            ImportError: onnxruntime is not installed.
+        """
+        try:
+            import onnxruntime
+        except ImportError as import_error:
+            raise ImportError(
+                "OnnxPredictModule requires onnxruntime. Install it with: pip install onnxruntime"
+            ) from import_error
+
+        if providers is None:
+            providers = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        self.session = onnxruntime.InferenceSession(model_path, providers=providers)
+        self.text_transform = text_transform
+
+    def predict(self, x: torch.Tensor) -> List[str]:
+        """Use this function during inference to predict.
+
+        Args:
+            x: Audio tensor of shape [batch_size, time]
+
+        Returns:
+            A list of strings, each one contains the corresponding transcription to the original batch element.
+        """
+        audio_lengths = torch.tensor(x.shape[0] * [x.shape[-1]])
+        probabilities, _ = self.session.run(
+            None,
+            {
+                "audio": x.cpu().numpy(),
+                "audio_lengths": audio_lengths.numpy(),
+            },
+        )
+        predictions = torch.from_numpy(probabilities).argmax(1)
+        return self.text_transform.decode_prediction(predictions)
@@ -11,23 +11,31 @@ __all__ = [
     "load_components_from_quartznet_config",
     "load_quartznet_weights",
     "load_quartznet_checkpoint",
+    "load_scripted_quartznet_checkpoint",
+    "fuse_quartznet_conv_bn",
 ]
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Tuple, Union
+from typing import List, Tuple, Union
 
 import torch
 from omegaconf import OmegaConf
 from torch import nn
 from torchaudio.datasets.utils import extract_archive
 
-from thunder.blocks import conv1d_decoder
+from thunder.blocks import Masked, conv1d_decoder
 from thunder.module import BaseCTCModule
-from thunder.quartznet.blocks import QuartznetEncoder
+from thunder.quartznet.blocks import MaskedConv1d, QuartznetBlock, QuartznetEncoder
 from thunder.quartznet.transform import FilterbankFeatures
 from thunder.text_processing.transform import BatchTextTransformer
-from thunder.utils import BaseCheckpoint, download_checkpoint
+from thunder.utils import (
+    BaseCheckpoint,
+    download_and_extract_checkpoint,
+    get_default_cache_folder,
+)
 
 
 # fmt:off
@@ -59,6 +67,16 @@ class QuartznetCheckpoint(BaseCheckpoint):
 # fmt:on
 
 
+@lru_cache(maxsize=4)
+def _read_config(config_path: str, _mtime: float) -> dict:
+    """Parse the .yaml config into a plain python container.
+
+    The modification time is part of the cache key only to invalidate
+    the entry when the file changes on disk.
+    """
+    return OmegaConf.to_container(OmegaConf.load(config_path), resolve=True)
+
+
 def load_components_from_quartznet_config(
     config_path: Union[str, Path]
 ) -> Tuple[nn.Module, nn.Module, BatchTextTransformer]:
@@ -71,9 +89,9 @@ def load_components_from_quartznet_config(
     Returns:
         A tuple containing, in this order, the encoder, the audio transform and the text transform
     """
-    conf = OmegaConf.load(config_path)
+    conf = _read_config(str(config_path), os.path.getmtime(config_path))
     encoder_params = conf["encoder"]["params"]
-    quartznet_conf = OmegaConf.to_container(encoder_params["jasper"])
+    quartznet_conf = encoder_params["jasper"]
 
     body_config = quartznet_conf[1:-2]
 
@@ -101,7 +119,7 @@ def load_components_from_quartznet_config(
     audio_transform = FilterbankFeatures(**preprocess_cfg)
     encoder = QuartznetEncoder(**encoder_cfg)
     text_transform = BatchTextTransformer(
-        tokens=OmegaConf.to_container(labels),
+        tokens=labels,
     )
 
     return (
@@ -119,7 +137,13 @@ def load_quartznet_weights(encoder: nn.Module, decoder: nn.Module, weights_path:
         decoder: Decoder module to load the weights into
         weights_path: Path to the pytorch weights checkpoint
     """
-    weights = torch.load(weights_path)
+    try:
+        # Memory-map the checkpoint so that pages are read lazily as
+        # load_state_dict touches them, instead of copying everything into ram
+        weights = torch.load(weights_path, mmap=True)
+    except TypeError:
+        # mmap is only supported on torch>=2.0
+        weights = torch.load(weights_path)
 
     def fix_encoder_name(x: str) -> str:
         x = x.replace("encoder.", "").replace(".res.0", ".res")
@@ -131,17 +155,18 @@ def load_quartznet_weights(encoder: nn.Module, decoder: nn.Module, weights_path:
         return x
 
     # We remove the 'encoder.' and 'decoder.' prefix from the weights to enable
-    # compatibility to load with plain nn.Modules created by reading the config
-    encoder_weights = {
-        fix_encoder_name(k): v for k, v in weights.items() if "encoder" in k
-    }
-    encoder.load_state_dict(encoder_weights, strict=True)
+    # compatibility to load with plain nn.Modules created by reading the config.
+    # A single pass over the weights buckets each key directly into the
+    # corresponding state dict, instead of scanning the whole checkpoint twice.
+    encoder_weights = {}
+    decoder_weights = {}
+    for key, weight in weights.items():
+        if key.startswith("encoder."):
+            encoder_weights[fix_encoder_name(key)] = weight
+        elif key.startswith("decoder."):
+            decoder_weights[key.replace("decoder.decoder_layers.0.", "")] = weight
 
-    decoder_weights = {
-        k.replace("decoder.decoder_layers.0.", ""): v
-        for k, v in weights.items()
-        if "decoder" in k
-    }
+    encoder.load_state_dict(encoder_weights, strict=True)
     decoder.load_state_dict(decoder_weights, strict=True)
 
 
@@ -157,13 +182,13 @@ def load_quartznet_checkpoint(
     Returns:
         The model loaded from the checkpoint
     """
-    if isinstance(checkpoint, QuartznetCheckpoint):
-        nemo_filepath = download_checkpoint(checkpoint, save_folder)
-    else:
-        nemo_filepath = Path(checkpoint)
-
     with TemporaryDirectory() as extract_folder:
-        extract_archive(str(nemo_filepath), extract_folder)
+        if isinstance(checkpoint, QuartznetCheckpoint):
+            # Extracts the archive while the download streams in,
+            # overlapping the network wait with the decompression
+            download_and_extract_checkpoint(checkpoint, extract_folder, save_folder)
+        else:
+            extract_archive(str(Path(checkpoint)), extract_folder)
         extract_path = Path(extract_folder)
         config_path = extract_path / "model_config.yaml"
         (
@@ -184,3 +209,92 @@ def load_quartznet_checkpoint(
             encoder_final_dimension=1024,
         )
         return module.eval()
+
+
+def load_scripted_quartznet_checkpoint(
+    checkpoint: Union[str, QuartznetCheckpoint], save_folder: str = None
+) -> torch.jit.ScriptModule:
+    """Load from the original nemo checkpoint and compile the model for inference.
+
+    The model is scripted and optimized with `torch.jit.optimize_for_inference`,
+    which removes the python dispatch overhead and fuses operations like
+    convolution followed by batch normalization. When loading a named checkpoint,
+    the compiled model is also cached to disk, so that loading it again
+    skips the torchscript compilation.
+
+    Args:
+        checkpoint: Path to local .nemo file or checkpoint to be downloaded locally and lodaded.
+        save_folder: Path to save the compiled model when downloading it. Ignored if you pass a .nemo file as the first argument.
+
+    Returns:
+        The compiled model loaded from the checkpoint
+    """
+    scripted_path = None
+    if isinstance(checkpoint, QuartznetCheckpoint):
+        cache_folder = Path(save_folder) if save_folder else get_default_cache_folder()
+        scripted_path = cache_folder / f"{checkpoint.name}_scripted.pt"
+        if scripted_path.exists():
+            return torch.jit.load(str(scripted_path))
+
+    module = load_quartznet_checkpoint(checkpoint, save_folder)
+    scripted = torch.jit.script(module.eval())
+    scripted = torch.jit.freeze(scripted, preserved_attrs=["predict"])
+    scripted = torch.jit.optimize_for_inference(scripted)
+
+    if scripted_path is not None:
+        torch.jit.save(scripted, str(scripted_path))
+    return scripted
+
+
+def _conv_bn_relu_groups(container: nn.Sequential, prefix: str) -> List[List[str]]:
+    # Collects the qualified names of each conv -> batchnorm (-> relu)
+    # sequence inside one of the block containers, unwrapping the
+    # MaskedConv1d and Masked layers that hold the actual modules
+    children = list(container)
+    groups = []
+    for i, child in enumerate(children):
+        if not isinstance(child, MaskedConv1d):
+            continue
+        if i + 1 >= len(children):
+            continue
+        following = children[i + 1]
+        if not (
+            isinstance(following, Masked)
+            and isinstance(following.layer[0], nn.BatchNorm1d)
+        ):
+            continue
+        names = [f"{prefix}.{i}.conv", f"{prefix}.{i + 1}.layer.0"]
+        if i + 2 < len(children):
+            maybe_relu = children[i + 2]
+            if isinstance(maybe_relu, Masked) and isinstance(
+                maybe_relu.layer[0], nn.ReLU
+            ):
+                names.append(f"{prefix}.{i + 2}.layer.0")
+        groups.append(names)
+    return groups
+
+
+def fuse_quartznet_conv_bn(module: BaseCTCModule) -> BaseCTCModule:
+    """Fuses the conv -> batchnorm (-> relu) sequences inside every encoder block.
+
+    Fusion folds the batchnorm statistics into the convolution weights, so
+    each sequence runs as a single operation instead of three separate memory
+    passes over the activations. Should be applied before scripting or
+    quantizing the module, and only for inference.
+
+    Args:
+        module: Module to be fused. Will be put in eval mode.
+
+    Returns:
+        The module with the encoder convolutions fused.
+    """
+    module = module.eval()
+    for block in module.encoder.modules():
+        if not isinstance(block, QuartznetBlock):
+            continue
+        groups = _conv_bn_relu_groups(block.mconv, "mconv")
+        if block.res is not None:
+            groups += _conv_bn_relu_groups(block.res, "res")
+        if groups:
+            torch.quantization.fuse_modules(block, groups, inplace=True)
+    return module
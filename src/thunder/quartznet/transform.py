@@ -59,9 +59,9 @@ from torch import nn
 from torchaudio.functional import melscale_fbanks
 
 from thunder.blocks import (
+    ConvolutionSTFT,
     Masked,
     MultiSequential,
-    convolution_stft,
     lengths_to_mask,
     normalize_tensor,
 )
@@ -299,5 +299,11 @@ def patch_stft(filterbank: nn.Module) -> nn.Module:
     Returns:
         Layer with the stft operation patched.
     """
-    filterbank[1].stft_func = convolution_stft
+    spectrum = filterbank[1]
+    spectrum.stft_func = ConvolutionSTFT(
+        spectrum.n_fft,
+        spectrum.hop_length,
+        spectrum.win_length,
+        spectrum.window,
+    )
     return filterbank
@@ -8,8 +8,7 @@
 
 __all__ = ["register_checkpoint_enum", "load_pretrained"]
 
-from functools import partial
-from typing import Callable, Dict, Type, Union
+from typing import Callable, Dict, Tuple, Type, Union
 
 from thunder.citrinet.compatibility import CitrinetCheckpoint, load_citrinet_checkpoint
 from thunder.huggingface.compatibility import load_huggingface_checkpoint
@@ -22,7 +21,7 @@ from thunder.utils import BaseCheckpoint
 
 CHECKPOINT_LOAD_FUNC_TYPE = Callable[..., BaseCTCModule]
 
-CHECKPOINT_REGISTRY: Dict[str, CHECKPOINT_LOAD_FUNC_TYPE] = {}
+CHECKPOINT_REGISTRY: Dict[str, Tuple[CHECKPOINT_LOAD_FUNC_TYPE, BaseCheckpoint]] = {}
 
 
 def register_checkpoint_enum(
@@ -35,9 +34,9 @@ def register_checkpoint_enum(
         load_function: function to load the checkpoint,
             must receive one instance of `checkpoints` as first argument"""
     for checkpoint in checkpoints:
-        CHECKPOINT_REGISTRY.update(
-            {checkpoint.name: partial(load_function, checkpoint)}
-        )
+        # Storing the plain (function, checkpoint) pair avoids the extra
+        # call indirection that a functools.partial would add
+        CHECKPOINT_REGISTRY[checkpoint.name] = (load_function, checkpoint)
 
 
 register_checkpoint_enum(QuartznetCheckpoint, load_quartznet_checkpoint)
@@ -61,6 +60,6 @@ def load_pretrained(
     if "/" in checkpoint_name:
         model_data = load_huggingface_checkpoint(checkpoint_name, **load_kwargs)
     else:
-        load_fn = CHECKPOINT_REGISTRY[checkpoint_name]
-        model_data = load_fn(**load_kwargs)
+        load_fn, checkpoint = CHECKPOINT_REGISTRY[checkpoint_name]
+        model_data = load_fn(checkpoint, **load_kwargs)
     return model_data
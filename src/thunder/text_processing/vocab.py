@@ -9,7 +9,7 @@ Classes that represent the vocabulary used by the model.
 
 __all__ = ["Vocabulary"]
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import torch
 from torch import nn
@@ -59,12 +59,29 @@ class Vocabulary(nn.Module):
         if self.unknown_token is not None:
             self._unk_idx = self.itos.index(self.unknown_token)
 
+    def special_tokens(
+        self,
+    ) -> Tuple[Optional[str], Optional[str], str, Optional[str], str]:
+        """Fetch all special tokens in a single access.
+
+        Returns:
+            Tuple with the start, end, pad, unknown and blank tokens, in this order.
+        """
+        return (
+            self.start_token,
+            self.end_token,
+            self.pad_token,
+            self.unknown_token,
+            self.blank_token,
+        )
+
     def _maybe_add_token(self, token: Optional[str]):
         # Only adds tokens if they are not optional
         # and are not included in the vocabulary already
         if token and (token not in self.itos):
             self.itos = self.itos + [token]
 
+    @torch.jit.export
     def numericalize(self, tokens: List[str]) -> torch.Tensor:
         """Function to transform a list of tokens into the corresponding numeric representation.
 
@@ -76,8 +93,14 @@ class Vocabulary(nn.Module):
         """
         if self.unknown_token is None:
             # When in there's no unknown token
-            # we filter out all of the tokens not in the vocab
-            tokens = [t for t in tokens if t in self.itos]
+            # we filter out all of the tokens not in the vocab.
+            # Written as an explicit loop because the torchscript frontend
+            # doesn't support comprehensions with an if clause.
+            kept: List[str] = []
+            for t in tokens:
+                if t in self.itos:
+                    kept.append(t)
+            tokens = kept
         return torch.tensor(
             [self.stoi.get(it, self._unk_idx) for it in tokens], dtype=torch.long
         )
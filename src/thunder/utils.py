@@ -14,11 +14,14 @@ __all__ = [
     "chain_calls",
     "BaseCheckpoint",
     "download_checkpoint",
+    "download_and_extract_checkpoint",
     "SchedulerBuilderType",
 ]
 
 import functools
 import os
+import tarfile
+import urllib.request
 from enum import Enum
 from pathlib import Path
 from typing import Callable, List, Type, Union
@@ -28,6 +31,7 @@ import wget
 from torch import nn
 from torch.optim import Optimizer
 from torch.optim.lr_scheduler import ReduceLROnPlateau, _LRScheduler
+from torchaudio.datasets.utils import extract_archive
 
 
 def audio_len(item: Union[Path, str]) -> float:
@@ -143,6 +147,62 @@ def download_checkpoint(name: BaseCheckpoint, checkpoint_folder: str = None) ->
     return checkpoint_path
 
 
+class _TeeReader:
+    """File-like wrapper that copies everything read from `source` into `copy_file`."""
+
+    def __init__(self, source, copy_file):
+        self.source = source
+        self.copy_file = copy_file
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.copy_file.write(data)
+        return data
+
+
+def download_and_extract_checkpoint(
+    name: BaseCheckpoint,
+    extract_folder: Union[str, Path],
+    checkpoint_folder: str = None,
+) -> Path:
+    """Download checkpoint by identifier, extracting the archive while it downloads.
+
+    The checkpoint archive is extracted directly from the network stream,
+    overlapping the download with the decompression, while the raw bytes are
+    saved to the cache folder so later calls skip the download entirely.
+
+    Args:
+        name: Model identifier. Check checkpoint_archives.keys()
+        extract_folder: Folder where the archive contents will be extracted to.
+        checkpoint_folder: Folder where the checkpoint will be saved to.
+
+    Returns:
+        Path to the saved checkpoint file.
+    """
+    if checkpoint_folder is None:
+        checkpoint_folder = get_default_cache_folder()
+
+    url = name.value
+    filename = url.split("/")[-1]
+    checkpoint_path = Path(checkpoint_folder) / filename
+
+    if checkpoint_path.exists():
+        extract_archive(str(checkpoint_path), extract_folder)
+        return checkpoint_path
+
+    # Download to a partial file first, so an interrupted download
+    # doesn't leave a corrupted checkpoint behind in the cache
+    partial_path = checkpoint_path.with_suffix(checkpoint_path.suffix + ".part")
+    with urllib.request.urlopen(url) as response:
+        with open(partial_path, "wb") as cache_file:
+            tee = _TeeReader(response, cache_file)
+            with tarfile.open(fileobj=tee, mode="r|*") as archive:
+                archive.extractall(extract_folder)
+    partial_path.rename(checkpoint_path)
+
+    return checkpoint_path
+
+
 # Reference to learning rate scheduler class
 _SchedulerClassType = Union[
     Type[_LRScheduler],
@@ -15,7 +15,10 @@ import torchaudio
 
 from tests.utils import mark_slow, requirescuda
 from thunder.data.datamodule import ManifestDatamodule
-from thunder.huggingface.compatibility import prepare_scriptable_wav2vec
+from thunder.huggingface.compatibility import (
+    prepare_scriptable_wav2vec,
+    scriptable_wav2vec_components,
+)
 from thunder.registry import load_pretrained
 
 
@@ -79,6 +82,26 @@ def test_script_module(wav2vec_base):
     assert fake_transcription[0] == scripted_transcription[0]
 
 
+@mark_slow
+def test_scripted_components_match_module(wav2vec_base):
+    torchaudio_module = _copy_model(wav2vec_base)
+    torchaudio_module.eval()
+    encoder, decoder = scriptable_wav2vec_components(torchaudio_module)
+
+    fake_input = torch.randn(1, 16000)
+    fake_transcription = wav2vec_base.predict(fake_input)
+
+    # The scripted encoder takes raw audio, including the normalization
+    audio_lengths = torch.tensor(fake_input.shape[0] * [fake_input.shape[-1]])
+    encoded, _ = encoder(fake_input, audio_lengths)
+    probabilities = decoder(encoded)
+    components_transcription = wav2vec_base.text_transform.decode_prediction(
+        probabilities.argmax(1)
+    )
+
+    assert fake_transcription[0] == components_transcription[0]
+
+
 @mark_slow
 def test_quantized_script_module(wav2vec_base):
     torchaudio_module = _copy_model(wav2vec_base)
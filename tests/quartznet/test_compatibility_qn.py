@@ -10,12 +10,17 @@ import torch
 
 from tests.utils import mark_slow
 from thunder.blocks import conv1d_decoder
+from thunder.module import BaseCTCModule
 from thunder.quartznet.blocks import QuartznetEncoder
 from thunder.quartznet.compatibility import (
     QuartznetCheckpoint,
+    fuse_quartznet_conv_bn,
     load_components_from_quartznet_config,
     load_quartznet_checkpoint,
+    load_scripted_quartznet_checkpoint,
 )
+from thunder.quartznet.transform import FilterbankFeatures
+from thunder.text_processing.transform import BatchTextTransformer
 
 
 @mark_slow
@@ -27,6 +32,30 @@ def test_can_load_weights():
         return
 
 
+@mark_slow
+def test_load_scripted_checkpoint(tmp_path):
+    try:
+        module = load_quartznet_checkpoint(
+            QuartznetCheckpoint.QuartzNet5x5LS_En, str(tmp_path)
+        )
+        scripted = load_scripted_quartznet_checkpoint(
+            QuartznetCheckpoint.QuartzNet5x5LS_En, str(tmp_path)
+        )
+    except HTTPError:
+        return
+
+    x = torch.randn(10, 1337)
+    assert module.predict(x)[0] == scripted.predict(x)[0]
+
+    # The second load skips the compilation and reads the cached file instead
+    scripted_path = tmp_path / "QuartzNet5x5LS_En_scripted.pt"
+    assert scripted_path.exists()
+    cached = load_scripted_quartznet_checkpoint(
+        QuartznetCheckpoint.QuartzNet5x5LS_En, str(tmp_path)
+    )
+    assert module.predict(x)[0] == cached.predict(x)[0]
+
+
 @mark_slow
 def test_create_from_manifest():
     path = Path("tests/nemo_config_samples")
@@ -52,3 +81,32 @@ def test_create_from_manifest():
         else:
             encoder2 = QuartznetEncoder(repeat_blocks=3)
             encoder2.load_state_dict(encoder.state_dict())
+
+
+def test_fuse_conv_bn_keeps_encoder_outputs():
+    module = BaseCTCModule(
+        encoder=QuartznetEncoder(filters=[256], kernel_sizes=[33]),
+        decoder=conv1d_decoder(256, 3),
+        audio_transform=FilterbankFeatures(),
+        text_transform=BatchTextTransformer(tokens=["a", "b"]),
+        encoder_final_dimension=256,
+    )
+    # A few train mode passes populate the batchnorm running statistics,
+    # so the fusion folds real values instead of the initialization ones
+    features = torch.randn(5, 64, 100)
+    feature_lengths = torch.tensor([100] * 5)
+    module.train()
+    for _ in range(3):
+        module.encoder(features, feature_lengths)
+    module.eval()
+
+    with torch.no_grad():
+        expected, _ = module.encoder(features, feature_lengths)
+    module = fuse_quartznet_conv_bn(module)
+    with torch.no_grad():
+        fused, _ = module.encoder(features, feature_lengths)
+
+    assert torch.allclose(expected, fused, atol=1e-5)
+    assert not any(
+        isinstance(m, torch.nn.BatchNorm1d) for m in module.encoder.modules()
+    )
@@ -0,0 +1,66 @@
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# Copyright (c) 2022 scart97
+
+import pytest
+
+import torch
+
+from thunder.blocks import conv1d_decoder
+from thunder.module import BaseCTCModule
+from thunder.onnx import OnnxPredictModule, export_onnx
+from thunder.quartznet.blocks import QuartznetEncoder
+from thunder.quartznet.transform import FilterbankFeatures
+from thunder.text_processing.transform import BatchTextTransformer
+
+
+@pytest.fixture
+def small_module():
+    module = BaseCTCModule(
+        encoder=QuartznetEncoder(filters=[256], kernel_sizes=[33]),
+        decoder=conv1d_decoder(1024, 4),
+        audio_transform=FilterbankFeatures(),
+        text_transform=BatchTextTransformer(tokens=["a", "b", "c"]),
+        encoder_final_dimension=1024,
+    )
+    return module.eval()
+
+
+def test_export_onnx_matches_eager(small_module, tmp_path):
+    onnxruntime = pytest.importorskip("onnxruntime")
+
+    model_path = str(tmp_path / "model.onnx")
+    export_onnx(small_module, model_path)
+    # The module compared here already has the export patches applied,
+    # so any difference comes from the onnx graph itself
+    x = torch.randn(2, 16000)
+    lengths = torch.tensor([16000, 16000])
+    with torch.no_grad():
+        expected, expected_lengths = small_module(x, lengths)
+
+    session = onnxruntime.InferenceSession(
+        model_path, providers=["CPUExecutionProvider"]
+    )
+    probabilities, prob_lengths = session.run(
+        None, {"audio": x.numpy(), "audio_lengths": lengths.numpy()}
+    )
+    assert torch.allclose(expected, torch.from_numpy(probabilities), atol=1e-4)
+    assert torch.equal(expected_lengths, torch.from_numpy(prob_lengths))
+
+
+def test_onnx_predict_module(small_module, tmp_path):
+    pytest.importorskip("onnxruntime")
+
+    model_path = str(tmp_path / "model.onnx")
+    export_onnx(small_module, model_path)
+    served = OnnxPredictModule(
+        model_path,
+        small_module.text_transform,
+        providers=["CPUExecutionProvider"],
+    )
+
+    x = torch.randn(1, 16000)
+    predictions = served.predict(x)
+    assert len(predictions) == 1
+    assert isinstance(predictions[0], str)
@@ -3,6 +3,7 @@
 
 # Copyright (c) 2021 scart97
 
+from functools import lru_cache
 from string import ascii_lowercase
 
 import pytest
@@ -14,23 +15,50 @@ from hypothesis.strategies import text
 from thunder.text_processing.tokenizer import char_tokenizer
 from thunder.text_processing.vocab import Vocabulary
 
+# Built once at import time instead of on every fixture call
+_INITIAL_TOKENS = (" ", *ascii_lowercase)
+_INP = ("a", "b", "c", "d", "e")
+_EXPECTED_PREFIX = torch.tensor([1, 2, 3], dtype=torch.long)
 
-@pytest.fixture
-def complex_vocab(request):
-    vocab = Vocabulary(
-        tokens=[" "] + list(ascii_lowercase),
+
+@lru_cache(maxsize=None)
+def _build_vocab(tokens, **special_tokens) -> Vocabulary:
+    # Keyed on the inputs, so identical vocab requests share one instance
+    return Vocabulary(tokens=list(tokens), **special_tokens)
+
+
+# The vocabs are never mutated by the tests, so one instance per
+# session avoids rebuilding them for every single test
+@pytest.fixture(scope="session")
+def complex_vocab():
+    return _build_vocab(
+        _INITIAL_TOKENS,
         pad_token="<pad>",
         unknown_token="<unk>",
         start_token="<bos>",
         end_token="<eos>",
     )
-    return vocab
 
 
-@pytest.fixture
-def simple_vocab(request):
-    vocab = Vocabulary(tokens=[" "] + list(ascii_lowercase))
-    return vocab
+@pytest.fixture(scope="session")
+def simple_vocab():
+    return _build_vocab(_INITIAL_TOKENS)
+
+
+@lru_cache(maxsize=None)
+def _build_scripted_vocab(tokens):
+    # Compiled at most once per token set, the torchscript frontend is expensive
+    return torch.jit.script(_build_vocab(tokens))
+
+
+# Scripting only pays off for the tensor-producing methods, so just the
+# numericalize/decode tests run both variants; the attribute-only tests
+# keep using the plain eager fixtures above
+@pytest.fixture(scope="session", params=[False, True], ids=["eager", "scripted"])
+def tensor_simple_vocab(request):
+    if request.param:
+        return _build_scripted_vocab(_INITIAL_TOKENS)
+    return _build_vocab(_INITIAL_TOKENS)
 
 
 def test_vocab_mapping_is_bidirectionally_correct(complex_vocab: Vocabulary):
@@ -54,27 +82,29 @@ def test_vocab_blank_is_not_the_unknown(complex_vocab: Vocabulary):
 def test_numericalize_adds_unknown_token(complex_vocab: Vocabulary):
     out = complex_vocab.numericalize(["a", "b", "c", "$"])
     unknown_idx = complex_vocab.itos.index(complex_vocab.unknown_token)
-    expected = torch.Tensor([1, 2, 3, unknown_idx])
-    assert (out == expected).all()
+    expected = torch.cat(
+        [_EXPECTED_PREFIX, torch.tensor([unknown_idx], dtype=torch.long)]
+    )
+    assert torch.equal(out, expected)
 
 
-def test_numericalize_nemo_ignores_unknown(simple_vocab: Vocabulary):
-    out = simple_vocab.numericalize(["a", "b", "c", "$"])
-    expected = torch.Tensor([1, 2, 3])
-    assert (out == expected).all()
+def test_numericalize_nemo_ignores_unknown(tensor_simple_vocab):
+    out = tensor_simple_vocab.numericalize(["a", "b", "c", "$"])
+    expected = _EXPECTED_PREFIX
+    assert torch.equal(out, expected)
 
 
 def test_numericalize_decode_is_bidirectionally_correct(complex_vocab: Vocabulary):
-    inp = ["a", "b", "c", "d", "e"]
+    inp = list(_INP)
     out1 = complex_vocab.numericalize(inp)
     out = complex_vocab.decode_into_text(out1)
     assert out == inp
 
 
-def test_nemo_numericalize_decode_is_bidirectionally_correct(simple_vocab: Vocabulary):
-    inp = ["a", "b", "c", "d", "e"]
-    out1 = simple_vocab.numericalize(inp)
-    out = simple_vocab.decode_into_text(out1)
+def test_nemo_numericalize_decode_is_bidirectionally_correct(tensor_simple_vocab):
+    inp = list(_INP)
+    out1 = tensor_simple_vocab.numericalize(inp)
+    out = tensor_simple_vocab.decode_into_text(out1)
     assert out == inp
 
 
@@ -91,15 +121,7 @@ def test_nemo_doesnt_add_special_tokens(simple_vocab: Vocabulary):
 
 
 def test_special_idx_are_different(complex_vocab: Vocabulary):
-    all_tokens = set(
-        [
-            complex_vocab.start_token,
-            complex_vocab.end_token,
-            complex_vocab.pad_token,
-            complex_vocab.unknown_token,
-            complex_vocab.blank_token,
-        ]
-    )
+    all_tokens = set(complex_vocab.special_tokens())
     # There's no problem if the blank_idx == pad_idx
     assert len(all_tokens) >= 4
 